@@ -1,8 +1,11 @@
 import base64
+import ctypes
 import io
-import sys
+import threading
 import time
-from typing import Callable, List, Union
+from ctypes import wintypes
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple, Union
 
 import psutil
 import pywintypes
@@ -13,119 +16,343 @@ import win32process
 
 from .utils import get_window_icon
 
-try:
+if TYPE_CHECKING:
     from PIL import Image
-except:
-    pass
+
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+# Single C callback shared by all enumerations, the result list is passed through lParam
+_WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, ctypes.py_object)
+_user32.EnumWindows.argtypes = (_WNDENUMPROC, ctypes.py_object)
+_user32.EnumWindows.restype = wintypes.BOOL
+_user32.EnumChildWindows.argtypes = (wintypes.HWND, _WNDENUMPROC, ctypes.py_object)
+_user32.EnumChildWindows.restype = wintypes.BOOL
+
+# Prebound prototypes for calls that orchestration scripts issue in bulk
+_ShowWindow = _user32.ShowWindow
+_ShowWindow.argtypes = (wintypes.HWND, ctypes.c_int)
+_ShowWindow.restype = wintypes.BOOL
+_PostMessageW = _user32.PostMessageW
+_PostMessageW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+_PostMessageW.restype = wintypes.BOOL
+_SetForegroundWindow = _user32.SetForegroundWindow
+_SetForegroundWindow.argtypes = (wintypes.HWND,)
+_SetForegroundWindow.restype = wintypes.BOOL
+_InternalGetWindowText = _user32.InternalGetWindowText
+_InternalGetWindowText.argtypes = (wintypes.HWND, wintypes.LPWSTR, ctypes.c_int)
+_InternalGetWindowText.restype = ctypes.c_int
+
+_TITLE_MAX_CHARS = 512
+_CLASS_NAME_MAX_CHARS = 256
+
+
+class _WINDOWPLACEMENT(ctypes.Structure):
+    _fields_ = [
+        ("length", wintypes.UINT),
+        ("flags", wintypes.UINT),
+        ("showCmd", wintypes.UINT),
+        ("ptMinPosition", wintypes.POINT),
+        ("ptMaxPosition", wintypes.POINT),
+        ("rcNormalPosition", wintypes.RECT),
+    ]
+
+
+_GetClassNameW = _user32.GetClassNameW
+_GetClassNameW.argtypes = (wintypes.HWND, wintypes.LPWSTR, ctypes.c_int)
+_GetClassNameW.restype = ctypes.c_int
+_IsIconic = _user32.IsIconic
+_IsIconic.argtypes = (wintypes.HWND,)
+_IsIconic.restype = wintypes.BOOL
+_IsWindowVisible = _user32.IsWindowVisible
+_IsWindowVisible.argtypes = (wintypes.HWND,)
+_IsWindowVisible.restype = wintypes.BOOL
+_GetWindowPlacement = _user32.GetWindowPlacement
+_GetWindowPlacement.argtypes = (wintypes.HWND, ctypes.POINTER(_WINDOWPLACEMENT))
+_GetWindowPlacement.restype = wintypes.BOOL
+
+_tls = threading.local()
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+_OpenProcess = _kernel32.OpenProcess
+_OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+_OpenProcess.restype = wintypes.HANDLE
+_QueryFullProcessImageNameW = _kernel32.QueryFullProcessImageNameW
+_QueryFullProcessImageNameW.argtypes = (wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, wintypes.PDWORD)
+_QueryFullProcessImageNameW.restype = wintypes.BOOL
+_CloseHandle = _kernel32.CloseHandle
+_CloseHandle.argtypes = (wintypes.HANDLE,)
+_CloseHandle.restype = wintypes.BOOL
+
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_IMAGE_PATH_MAX_CHARS = 1024
+
+
+@_WNDENUMPROC
+def _collect_hwnd(hwnd, hwnds):
+    hwnds.append(hwnd)
+    return True
+
+
+@_WNDENUMPROC
+def _find_hwnd(hwnd, search):
+    """search is [predicate, found_hwnd], returning False stops the enumeration at the first match"""
+    try:
+        if search[0](hwnd):
+            search[1] = hwnd
+            return False
+    except Exception:
+        pass  # Exceptions can't propagate through the C callback, count it as no match
+    return True
+
+
+def _get_unicode_buffer(size: int) -> ctypes.Array:
+    """Reusable per-thread buffer, callers must copy .value out before the next call"""
+    buffers = getattr(_tls, "buffers", None)
+    if buffers is None:
+        buffers = _tls.buffers = {}
+    buffer = buffers.get(size)
+    if buffer is None:
+        buffer = buffers[size] = ctypes.create_unicode_buffer(size)
+    return buffer
+
+
+def _raise_last_error(func_name: str):
+    """Raise the same pywintypes.error that win32gui would"""
+    code = ctypes.get_last_error()
+    raise pywintypes.error(code, func_name, win32api.FormatMessage(code).strip())
+
+
+def _get_class_name(hwnd: int) -> str:
+    buffer = _get_unicode_buffer(_CLASS_NAME_MAX_CHARS)
+    if not _GetClassNameW(hwnd, buffer, _CLASS_NAME_MAX_CHARS):
+        _raise_last_error("GetClassName")
+    return buffer.value
+
+
+def _get_window_text(hwnd: int) -> str:
+    """Stored caption of the window, never sends WM_GETTEXT so busy windows are read as well"""
+    buffer = _get_unicode_buffer(_TITLE_MAX_CHARS)
+    length = _InternalGetWindowText(hwnd, buffer, _TITLE_MAX_CHARS)
+    return buffer[:length]
+
+
+def _get_process_name(pid: int) -> Optional[str]:
+    """Exe name of the process with a single image name query. None if the process is gone or not accessible"""
+    handle = _OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        buffer = ctypes.create_unicode_buffer(_IMAGE_PATH_MAX_CHARS)
+        size = wintypes.DWORD(_IMAGE_PATH_MAX_CHARS)
+        if not _QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            return None
+        return buffer.value.rsplit("\\", 1)[-1]
+    finally:
+        _CloseHandle(handle)
+
+
+@dataclass(frozen=True)
+class WindowSnapshot:
+    """
+    Window state captured at once to avoid repeated Win32 calls.
+    Title and rect are read only for visible, not minimized windows, otherwise they are empty
+    """
+
+    title: str
+    rect: Tuple[int, int, int, int]
+    style: int  # GWL_STYLE
+    is_visible: bool
+
+
+_HIDDEN_SNAPSHOT = WindowSnapshot("", (0, 0, 0, 0), 0, False)  # Also used for destroyed windows
 
 
 class Window:
+    """
+    Wrapper of a window handle.
+    Process ids, class name etc. are cached on first access, so instances should not outlive the window itself
+    """
+
     # This is wrapper for UWP apps
     _UWP_EXE = "ApplicationFrameHost.exe"
+    _UWP_CLASS = "ApplicationFrameWindow"
 
-    def __init__(self, hwnd: int) -> None:
+    def __init__(self, hwnd: int, cache_title: bool = False) -> None:
         self.hwnd = hwnd
+        self.cache_title = cache_title  # Title can change, so it is not cached by default
+        self._class_name = self._title = None
+        self._tid = self._pid = self._proc = None
+        self._exe = self._process_name = None
+        self._layered = False
+
+    def _ids(self) -> Tuple[int, int]:
+        """(thread_id, process_id) of the window, queried once per instance"""
+        if self._pid is None:
+            self._tid, self._pid = win32process.GetWindowThreadProcessId(self.hwnd)
+        return self._tid, self._pid
 
     def exists(self) -> bool:
-        if not win32gui.IsWindow(self.hwnd):
-            return True
-        else:
-            return False
+        return bool(win32gui.IsWindow(self.hwnd))
+
+    def snapshot(self) -> WindowSnapshot:
+        # Most top-level windows are hidden, they cost a single call. A destroyed window is not visible either
+        if not _IsWindowVisible(self.hwnd):
+            return _HIDDEN_SNAPSHOT
+        try:
+            style = self._get_style()
+            if style & win32con.WS_MINIMIZE:
+                return WindowSnapshot(title="", rect=(0, 0, 0, 0), style=style, is_visible=True)
+            return WindowSnapshot(
+                title=_get_window_text(self.hwnd),
+                rect=win32gui.GetWindowRect(self.hwnd),
+                style=style,
+                is_visible=True,
+            )
+        except pywintypes.error:
+            return _HIDDEN_SNAPSHOT  # Window was destroyed in the meantime
 
     def get_title(self) -> str:
-        return win32gui.GetWindowText(self.hwnd)
+        if self._title is not None:
+            return self._title
+        title = _get_window_text(self.hwnd)
+        if self.cache_title:
+            self._title = title
+        return title
 
     def get_thread_id(self) -> int:
-        thread_id, process_id = win32process.GetWindowThreadProcessId(self.hwnd)
-        return thread_id
+        return self._ids()[0]
 
     def get_process_id(self) -> int:
-        thread_id, process_id = win32process.GetWindowThreadProcessId(self.hwnd)
-        return process_id
+        return self._ids()[1]
 
     def get_process(self) -> psutil.Process:
-        return psutil.Process(self._process_id)
-
-    def get_icon(self, base64=False) -> "Image":
-        if "PIL.Image" not in sys.modules:
-            raise ImportError("Missing Pillow lib")
+        if self._proc is None:
+            self._proc = psutil.Process(self.get_process_id())
+        return self._proc
+
+    def get_process_name(self) -> Optional[str]:
+        """Exe name, same lookup as the exe filters use. None if the process is gone or not accessible"""
+        if self._process_name is None:
+            self._process_name = _get_process_name(self.get_process_id())
+        return self._process_name
+
+    def get_exe(self) -> str:
+        """Full path of the process executable, it can't change for the process lifetime"""
+        if self._exe is None:
+            self._exe = self.get_process().exe()
+        return self._exe
+
+    def get_icon(self, as_base64: bool = False) -> Union["Image.Image", str]:
+        """40x40 icon image or, with as_base64, the icon as base64 encoded PNG"""
         try:
-            return get_window_icon(self.hwnd)
+            icon = get_window_icon(self.hwnd)
+        except ImportError as e:
+            raise ImportError("Missing Pillow lib, pip install Pillow") from e
         except:
             return None
+        if as_base64:
+            buffer = io.BytesIO()
+            # Fast zlib level, the size gain of the default level is negligible for a 40x40 icon
+            icon.save(buffer, format="PNG", optimize=False, compress_level=1)
+            return base64.b64encode(buffer.getvalue()).decode("ascii")
+        return icon
 
     def get_class_name(self) -> str:
-        return win32gui.GetClassName(self.hwnd)
+        if self._class_name is None:
+            self._class_name = _get_class_name(self.hwnd)
+        return self._class_name
 
     def get_children(self) -> List["Window"]:
-        children_windows = []
+        hwnds = []
+        _user32.EnumChildWindows(self.hwnd, _collect_hwnd, ctypes.py_object(hwnds))
+        return [Window(hwnd) for hwnd in hwnds]
 
-        def callback(hwnd, windows):
-            windows.append(Window(hwnd))
-            return True
-
-        win32gui.EnumChildWindows(self.hwnd, callback, children_windows)
-        return children_windows
+    def _enum_children_until(self, predicate: Callable[[int], bool]) -> Optional["Window"]:
+        """First child window which hwnd satisfies predicate, the rest of children are not enumerated"""
+        search = [predicate, None]
+        _user32.EnumChildWindows(self.hwnd, _find_hwnd, ctypes.py_object(search))
+        return Window(search[1]) if search[1] is not None else None
 
     def is_uwp(self) -> bool:
-        """Check if this is UWP wrapper process(window)"""
+        """Check if this is UWP wrapper window. Uses class name only, no process lookup"""
+        try:
+            return self.get_class_name() == self._UWP_CLASS
+        except pywintypes.error:
+            return False
+
+    def is_uwp_strict(self) -> bool:
+        """Check if this is UWP wrapper process(window) by its exe name"""
         try:
-            return self.get_process().name() == self._UWP_EXE
+            return self.get_process_name() == self._UWP_EXE
         except:
             return False
 
     def get_uwp_window(self) -> "Window":
         """Get real app window (wrapped into uwp) to gain access to the real app process"""
-        for child in self.get_children():
-            try:
-                child_process = psutil.Process(child.get_process_id())
-                # Exclude ApplicationFrameHost.exe to avoid recursion
-                if child_process.name() != self._UWP_EXE:
-                    return child
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        process_name = _process_name_lookup()  # Children mostly share a few processes
+
+        def is_app_window(hwnd: int) -> bool:
+            name = process_name(win32process.GetWindowThreadProcessId(hwnd)[1])
+            # Exclude ApplicationFrameHost.exe to avoid recursion
+            return name is not None and name != self._UWP_EXE
+
+        return self._enum_children_until(is_app_window)
 
     def minimize(self):
-        win32gui.ShowWindow(self.hwnd, win32con.SW_MINIMIZE)
+        _ShowWindow(self.hwnd, win32con.SW_MINIMIZE)
 
     def maximize(self) -> bool:
-        win32gui.ShowWindow(self.hwnd, win32con.SW_MAXIMIZE)
+        _ShowWindow(self.hwnd, win32con.SW_MAXIMIZE)
 
     def restore(self) -> bool:
-        win32gui.ShowWindow(self.hwnd, win32con.SW_RESTORE)
+        _ShowWindow(self.hwnd, win32con.SW_RESTORE)
 
     def close(self):
-        try:
-            win32gui.PostMessage(self.hwnd, win32con.WM_CLOSE, 0, 0)
-        except pywintypes.error as e:
+        if not _PostMessageW(self.hwnd, win32con.WM_CLOSE, 0, 0):
             return False  # Access is denied
 
-    def set_foreground(self):
-        win32gui.SetForegroundWindow(self.hwnd)
+    def set_foreground(self) -> bool:
+        return bool(_SetForegroundWindow(self.hwnd))
+
+    def _get_style(self) -> int:
+        return win32gui.GetWindowLong(self.hwnd, win32con.GWL_STYLE)
 
-    def is_minimized(self) -> bool:
-        # # SW_SHOWMINIMIZED (2) indicates the window is minimized.
-        # placement = win32gui.GetWindowPlacement(self.hwnd) (2, 2, (-25600, -25600), (-1, -1), (40, 0, 1078, 808))
-        # return placement[1] == win32con.SW_SHOWMINIMIZED
-        return bool(win32gui.IsIconic(self.hwnd))
+    def show_state(self) -> int:
+        """WINDOWPLACEMENT.showCmd: SW_SHOWMINIMIZED, SW_SHOWMAXIMIZED or SW_SHOWNORMAL"""
+        placement = _WINDOWPLACEMENT()
+        placement.length = ctypes.sizeof(_WINDOWPLACEMENT)
+        if not _GetWindowPlacement(self.hwnd, ctypes.byref(placement)):
+            _raise_last_error("GetWindowPlacement")
+        return placement.showCmd
 
-    def is_maximized(self) -> bool:
-        placement = win32gui.GetWindowPlacement(self.hwnd)
-        return placement[1] == win32con.SW_SHOWMAXIMIZED
+    def is_minimized(self, snapshot: Optional[WindowSnapshot] = None) -> bool:
+        if snapshot is not None:
+            return bool(snapshot.style & win32con.WS_MINIMIZE)
+        return bool(_IsIconic(self.hwnd))
 
-    def is_normal(self) -> bool:
-        placement = win32gui.GetWindowPlacement(self.hwnd)
-        return placement[1] == win32con.SW_SHOWNORMAL
+    def is_maximized(self, snapshot: Optional[WindowSnapshot] = None) -> bool:
+        style = snapshot.style if snapshot is not None else self._get_style()
+        return bool(style & win32con.WS_MAXIMIZE)
+
+    def is_normal(self, snapshot: Optional[WindowSnapshot] = None) -> bool:
+        style = snapshot.style if snapshot is not None else self._get_style()
+        return not (style & (win32con.WS_MAXIMIZE | win32con.WS_MINIMIZE))
 
     def is_visible(self) -> bool:
-        return win32gui.IsWindowVisible(self.hwnd) == 1
+        return bool(_IsWindowVisible(self.hwnd))
 
-    def is_truly_visible(self) -> bool:
+    def is_truly_visible(self, snapshot: Optional[WindowSnapshot] = None) -> bool:
         """Checks also if windows size is not 0 and it is on screen"""
-        if not self.is_visible():
-            return False
-
-        left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
+        if snapshot is not None:
+            if not snapshot.is_visible:
+                return False
+            left, top, right, bottom = snapshot.rect
+        else:
+            if not self.is_visible():
+                return False
+            left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
 
         # Check windows size
         width = right - left
@@ -143,9 +370,6 @@ class Window:
         win32gui.SetWindowPos(self.hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0, win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
 
     def set_window_fullscreen(self):
-        # screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
-        # screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
-
         style = win32gui.GetWindowLong(self.hwnd, win32con.GWL_STYLE)
 
         new_style = style & ~win32con.WS_CAPTION & ~win32con.WS_THICKFRAME
@@ -177,21 +401,19 @@ class Window:
         :param hwnd: Handle to the window.
         :param transparency: Transparency level (0-255). 255 is fully opaque, 0 is fully transparent.
         """
-        # Get the current window styles
-        ex_style = win32gui.GetWindowLong(self.hwnd, win32con.GWL_EXSTYLE)
-
-        # Add layered window style if not already set
-        if not (ex_style & win32con.WS_EX_LAYERED):
-            ex_style |= win32con.WS_EX_LAYERED
-            win32gui.SetWindowLong(self.hwnd, win32con.GWL_EXSTYLE, ex_style)
+        # Add layered window style if not already set. Checked once, repeated calls (fading) skip it
+        if not self._layered:
+            ex_style = win32gui.GetWindowLong(self.hwnd, win32con.GWL_EXSTYLE)
+            if not (ex_style & win32con.WS_EX_LAYERED):
+                win32gui.SetWindowLong(self.hwnd, win32con.GWL_EXSTYLE, ex_style | win32con.WS_EX_LAYERED)
+            self._layered = True
 
-        # ctypes.windll.user32.SetLayeredWindowAttributes(hwnd, color_key, 0, win32con.LWA_COLORKEY)
         win32gui.SetLayeredWindowAttributes(self.hwnd, 0, transparency, win32con.LWA_ALPHA)
 
     def __repr__(self) -> str:
         exe = ""
         try:
-            exe = self.get_process().exe()
+            exe = self.get_exe()
         except Exception as e:
             exe = e
         return str({"title": self.get_title(), "exe": exe, "class": self.get_class_name()})
@@ -199,12 +421,7 @@ class Window:
 
 def _get_hwnds() -> List[int]:
     hwnds = []
-
-    def callback(hwnd, extra):
-        hwnds.append(hwnd)
-        return True
-
-    win32gui.EnumWindows(callback, None)  # None is extra
+    _user32.EnumWindows(_collect_hwnd, ctypes.py_object(hwnds))
     return hwnds
 
 
@@ -222,51 +439,115 @@ def get_foreground_window() -> Window:
     return Window(hwnd)
 
 
+def _process_name_lookup() -> Callable[[int], Optional[str]]:
+    """
+    pid -> exe name, memoized for one enumeration. Only pids actually asked for are queried,
+    each with a single process open. None if the process is gone or not accessible
+    """
+    process_names = {}
+
+    def lookup(pid: int) -> Optional[str]:
+        if pid not in process_names:
+            process_names[pid] = _get_process_name(pid)
+        return process_names[pid]
+
+    return lookup
+
+
+def _iter_hwnds_filtered(
+    *,
+    visible: bool = None,
+    minimized: bool = None,
+    title: str = None,
+    title_substr: bool = False,
+    pid: int = None,
+    exe: str = None,
+    class_name: str = None,
+) -> Iterator[Window]:
+    """
+    Single pass over top-level windows,
+    checks go from cheapest to most expensive: visible -> minimized -> class -> title -> pid -> exe
+    """
+    if title is not None and title_substr:
+        title = title.lower()
+    process_name = _process_name_lookup() if exe is not None else None
+
+    for hwnd in _get_hwnds():
+        window = Window(hwnd)
+        try:
+            if visible is not None and window.is_visible() != visible:
+                continue
+            if minimized is not None and window.is_minimized() != minimized:
+                continue
+            if class_name is not None and window.get_class_name() != class_name:
+                continue
+            if title is not None:
+                window_title = window.get_title()
+                if title_substr:
+                    if title not in window_title.lower():
+                        continue
+                elif window_title != title:
+                    continue
+            if pid is not None and window.get_process_id() != pid:
+                continue
+            if exe is not None and process_name(window.get_process_id()) != exe:
+                continue
+        except pywintypes.error:
+            continue  # Window is already gone
+        yield window
+
+
+def enumerate_windows(
+    *,
+    visible: bool = None,
+    minimized: bool = None,
+    title: str = None,
+    title_substr: bool = False,
+    pid: int = None,
+    exe: str = None,
+    class_name: str = None,
+) -> List[Window]:
+    """Windows matching all given filters. Ordered starting from topmost"""
+    return list(
+        _iter_hwnds_filtered(
+            visible=visible,
+            minimized=minimized,
+            title=title,
+            title_substr=title_substr,
+            pid=pid,
+            exe=exe,
+            class_name=class_name,
+        )
+    )
+
+
 def get_windows_by_title(title: str, includes=False) -> List[Window]:
-    windows = []
-    for window in get_all_windows():
-        if includes and title.lower() in window.get_title().lower():
-            windows.append(window)
-        elif window.get_title() == title:
-            windows.append(window)
-    return windows
+    return enumerate_windows(title=title, title_substr=includes)
 
 
 def get_window_by_pid(pid: int) -> Window:
-    for window in get_all_windows():
-        if window.get_process_id() == pid:
-            return window
+    return next(_iter_hwnds_filtered(pid=pid), None)
 
 
 def get_windows_by_exe_name(exe_name: str) -> List[Window]:
-    windows = []
-    for window in get_all_windows():
-        try:
-            if window.get_process().name() == exe_name:
-                windows.append(window)
-        except:
-            continue
-    return windows
+    return enumerate_windows(exe=exe_name)
 
 
 def get_windows_by_class_name(class_name: str) -> List[Window]:
-    windows = []
-    for window in get_all_windows():
-        if window.get_class_name() == class_name:
-            windows.append(window)
-    return windows
+    return enumerate_windows(class_name=class_name)
 
 
-def get_windows_with_opened_gui(self) -> List[Window]:
+def get_windows_with_opened_gui() -> List[Window]:
     windows = []
     for window in get_all_windows():
-        if not window.exists():
+        snapshot = window.snapshot()
+        if not snapshot.is_visible:
             continue
-        if window.is_minimized():
+        if window.is_minimized(snapshot):
             continue
-        if not window.is_truly_visible():
+        if not window.is_truly_visible(snapshot):
             continue
-        if not window.get_title():
+        if not snapshot.title:
             continue
         windows.append(window)
     return windows
@@ -276,19 +557,21 @@ def filter_windows_by(windows: List[Window], *, title=None, exe_name=None, class
     if not (title or exe_name or class_name):
         raise ValueError("At least one of title, exe_name, or class_name must be provided")
 
+    process_name = _process_name_lookup()
     filtered_windows = []
     for window in windows:
+        # Cheapest checks first, a process is opened only when exe_name is requested and once per pid
         try:
-            if exe_name and window.get_process().name() == exe_name:
+            if class_name and window.get_class_name() == class_name:
                 filtered_windows.append(window)
-        except:
-            pass
-
-        if title and window.get_title() == title:
-            filtered_windows.append(window)
-
-        if class_name and window.get_class_name() == class_name:
-            filtered_windows.append(window)
+                continue
+            if title and window.get_title() == title:
+                filtered_windows.append(window)
+                continue
+            if exe_name and process_name(window.get_process_id()) == exe_name:
+                filtered_windows.append(window)
+        except pywintypes.error:
+            continue
 
     return filtered_windows
 
@@ -297,10 +580,11 @@ def filter_non_explorer_windows(windows: List[Window]) -> List[Window]:
     """
     Removes all system explorer.exe windows(taskbar etc.) except "File Explorer" app windows itself
     """
+    process_name = _process_name_lookup()
     filtered_windows = []
     for w in windows:
         try:
-            if w.get_process().name() == "explorer.exe" and w.get_class_name() not in [
+            if process_name(w.get_process_id()) == "explorer.exe" and w.get_class_name() not in [
                 "CabinetWClass",
                 "ExplorerWClass",
             ]:
@@ -320,11 +604,15 @@ def is_uwp_loaded(w: Window, timeout: float = 5) -> bool:
     """
     if not w.is_uwp():
         raise Exception("It is not UWP wrapper app")
-    stop_t = time.time() + timeout
+    stop_t = time.monotonic() + timeout
+    delay = 0.001  # Backoff: fast app loads are noticed within ~1 ms, slow ones are polled at most every 50 ms
     child = w.get_uwp_window()
     while not child:
-        if time.time() > stop_t:
+        remaining = stop_t - time.monotonic()
+        if remaining <= 0:
             return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.05)
         child = w.get_uwp_window()
     return True
 
@@ -1,22 +1,40 @@
-import ctypes, sys
-import win32api, win32con
+import ctypes, subprocess, sys
+import win32api, win32con, win32security
 
 from pathlib import Path
 
 ROOT = Path(__file__).parent.absolute()
 
+_IsUserAnAdmin = ctypes.windll.shell32.IsUserAnAdmin
+_IsUserAnAdmin.argtypes = ()
+_IsUserAnAdmin.restype = ctypes.c_int
 
-def is_admin():
+
+def is_admin() -> bool:
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
+        return bool(_IsUserAnAdmin())
+    except OSError:
         return False
 
 
+def enable_privilege(privilege_name: str):
+    """Enable privilege (e.g. win32security.SE_SHUTDOWN_NAME) in the current process token"""
+    token = win32security.OpenProcessToken(
+        win32api.GetCurrentProcess(), win32security.TOKEN_ADJUST_PRIVILEGES | win32security.TOKEN_QUERY
+    )
+    try:
+        luid = win32security.LookupPrivilegeValue(None, privilege_name)
+        win32security.AdjustTokenPrivileges(token, False, [(luid, win32security.SE_PRIVILEGE_ENABLED)])
+    finally:
+        token.Close()
+
+
 def rerun_with_admin_privileges():
     # Re-run the program with admin rights
-    # ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
-    win32api.ShellExecute(None, "runas", sys.executable, " ".join(sys.argv), None, win32con.SW_SHOWNORMAL)
+    # Frozen executable is sys.executable itself, so its argv[0] must not be passed again
+    args = sys.argv[1:] if getattr(sys, "frozen", False) else sys.argv
+    params = subprocess.list2cmdline(args) if args else ""
+    win32api.ShellExecute(None, "runas", sys.executable, params, None, win32con.SW_SHOWNORMAL)
 
 
 if __name__ == "__main__":
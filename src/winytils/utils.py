@@ -1,19 +1,19 @@
 import ctypes
-import logging
-import time
-import traceback
+import threading
 from ctypes import wintypes
+from typing import TYPE_CHECKING
 
 import win32con
 import win32gui
 
-logger = logging.getLogger("winytils")
-
-try:
+if TYPE_CHECKING:
     from PIL import Image
-except:
-    pip = "pip install Pillow"
-    logging.getLogger("winytils").debug(pip)
+
+ICON_SIZE = (40, 40)
+
+_GetBitmapBits = ctypes.WinDLL("gdi32").GetBitmapBits
+_GetBitmapBits.argtypes = (wintypes.HBITMAP, wintypes.LONG, wintypes.LPVOID)
+_GetBitmapBits.restype = wintypes.LONG
 
 
 class ICONINFO(ctypes.Structure):
@@ -26,9 +26,30 @@ class ICONINFO(ctypes.Structure):
     ]
 
 
-def _get_icon_info(h_icon):
-    icon_info = ICONINFO()
-    ctypes.windll.user32.GetIconInfo(h_icon, ctypes.byref(icon_info))
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+_GetIconInfo = _user32.GetIconInfo
+_GetIconInfo.argtypes = (wintypes.HICON, ctypes.POINTER(ICONINFO))
+_GetIconInfo.restype = wintypes.BOOL
+_CopyImage = _user32.CopyImage
+_CopyImage.argtypes = (wintypes.HANDLE, wintypes.UINT, ctypes.c_int, ctypes.c_int, wintypes.UINT)
+_CopyImage.restype = wintypes.HANDLE
+_DestroyIcon = _user32.DestroyIcon
+_DestroyIcon.argtypes = (wintypes.HICON,)
+_DestroyIcon.restype = wintypes.BOOL
+
+_icon_info_tls = threading.local()
+
+
+def _get_icon_info(h_icon) -> ICONINFO:
+    """Reuses one ICONINFO per thread, so read its fields before the next call"""
+    icon_info = getattr(_icon_info_tls, "icon_info", None)
+    if icon_info is None:
+        icon_info = _icon_info_tls.icon_info = ICONINFO()
+    else:
+        ctypes.memset(ctypes.addressof(icon_info), 0, ctypes.sizeof(icon_info))
+    if not _GetIconInfo(h_icon, ctypes.byref(icon_info)):
+        raise ValueError("Failed to get icon info.")
     return icon_info
 
 
@@ -37,16 +58,14 @@ def _get_bitmap_bits(hbm, width, height):
     Retrieve raw bitmap data using ctypes and the GetBitmapBits API.
     """
     buffer_len = width * height * 4  # 4 bytes per pixel (RGBA)
-    buffer = ctypes.create_string_buffer(buffer_len)
-
-    hbm = wintypes.HBITMAP(hbm)
+    buffer = bytearray(buffer_len)
 
-    # Call GetBitmapBits from the GDI API
-    success = ctypes.windll.gdi32.GetBitmapBits(hbm, buffer_len, buffer)
+    # GetBitmapBits writes straight into the returned buffer, no intermediate string buffer copy
+    success = _GetBitmapBits(hbm, buffer_len, (ctypes.c_char * buffer_len).from_buffer(buffer))
     if not success:
         raise RuntimeError("Failed to retrieve bitmap bits.")
 
-    return buffer.raw
+    return buffer
 
 
 def _get_hicon(hwnd) -> int:
@@ -63,35 +82,49 @@ def _get_hicon(hwnd) -> int:
     return hicon
 
 
-def get_window_icon(hwnd) -> "Image":
+def get_window_icon(hwnd) -> "Image.Image":
+    # Imported on first use, so importing winytils doesn't pay for Pillow
+    from PIL import Image
+
     hicon = _get_hicon(hwnd)
     if not hicon:
         raise ValueError("No icon found for this window.")
 
-    # Get ICONINFO structure
-    icon_info = _get_icon_info(hicon)
-
-    # Extract color and mask bitmaps
-    hbm_color = icon_info.hbmColor
-    hbm_mask = icon_info.hbmMask
-
-    # Get dimensions from the color bitmap
-    bmp_info = win32gui.GetObject(hbm_color)
-    width, height = bmp_info.bmWidth, bmp_info.bmHeight
-
-    # Create a device context for drawing
-    hdc = win32gui.GetDC(0)
-    hdc_mem = win32gui.CreateCompatibleDC(hdc)
-    win32gui.SelectObject(hdc_mem, hbm_color)
-
-    # Extract raw pixel data
-    bmp_bits = _get_bitmap_bits(hbm_color, width, height)
-    img = Image.frombuffer("RGBA", (width, height), bmp_bits, "raw", "BGRA", 0, 1)
-
-    # Release resources
-    win32gui.DeleteObject(hbm_color)
-    win32gui.DeleteObject(hbm_mask)
-    win32gui.DeleteDC(hdc_mem)
-    win32gui.ReleaseDC(0, hdc)
-
-    return img.resize((40, 40))
+    # Let the system scale the icon, so only ICON_SIZE pixels are copied out and no resize is needed.
+    # The copy is ours to destroy, the original is not. Falls back to the original icon if scaling fails
+    hicon_scaled = _CopyImage(hicon, win32con.IMAGE_ICON, ICON_SIZE[0], ICON_SIZE[1], 0)
+    try:
+        # Get ICONINFO structure
+        icon_info = _get_icon_info(hicon_scaled or hicon)
+
+        # Extract color and mask bitmaps. They are copies owned by us
+        hbm_color = icon_info.hbmColor
+        hbm_mask = icon_info.hbmMask
+
+        try:
+            if not hbm_color:
+                raise ValueError("Monochrome icons are not supported.")
+
+            # Get dimensions from the color bitmap
+            bmp_info = win32gui.GetObject(hbm_color)
+            width, height = bmp_info.bmWidth, bmp_info.bmHeight
+
+            # Extract raw pixel data, GetBitmapBits reads the bitmap directly so no device context is needed
+            bmp_bits = _get_bitmap_bits(hbm_color, width, height)
+            img = Image.frombuffer("RGBA", (width, height), bmp_bits, "raw", "BGRA", 0, 1)
+        finally:
+            # Release resources
+            if hbm_color:
+                win32gui.DeleteObject(hbm_color)
+            if hbm_mask:
+                win32gui.DeleteObject(hbm_mask)
+    finally:
+        if hicon_scaled:
+            _DestroyIcon(hicon_scaled)
+
+    if (width, height) == ICON_SIZE:
+        return img
+    if width <= ICON_SIZE[0] and height <= ICON_SIZE[1]:
+        # Upscaling small icons, nearest neighbor is the cheapest filter and keeps them sharp
+        return img.resize(ICON_SIZE, Image.NEAREST)
+    return img.resize(ICON_SIZE)
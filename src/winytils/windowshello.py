@@ -1,6 +1,8 @@
 import asyncio
+import atexit
 import sys
 import logging
+import threading
 
 try:
     from winrt.windows.security.credentials.ui import (
@@ -10,6 +12,28 @@ except ImportError:
     pip = "pip install winrt.windows.security.credentials.ui"
     logging.getLogger("winytils").debug(pip)
 
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Loop shared by all prompts. Runs in its own thread, so callers may already have a running loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="winytils-windowshello", daemon=True)
+            thread.start()
+            atexit.register(_close_loop, _loop, thread)
+    return _loop
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread):
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not thread.is_alive():  # A running loop can't be closed
+        loop.close()
+
 
 async def windows_hello_prompt_async() -> int:
     """result 0 means success"""
@@ -25,5 +49,5 @@ async def windows_hello_prompt_async() -> int:
 
 
 def windows_hello_prompt() -> int:
-    return asyncio.run(windows_hello_prompt_async())
+    return asyncio.run_coroutine_threadsafe(windows_hello_prompt_async(), _get_loop()).result()
 
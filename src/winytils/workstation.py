@@ -1,10 +1,51 @@
 import ctypes
-import os
 import threading
 import time
+from ctypes import wintypes
 
+import win32con
+import win32security
+
+from .privileges import enable_privilege
 from .workstation_events import WorkstationStateMonitor
 
+_SHTDN_REASON_FLAG_PLANNED = 0x80000000
+_DEFAULT_SHUTDOWN_DELAY = 30  # Same as shutdown.exe
+
+_advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+_InitiateSystemShutdownExW = _advapi32.InitiateSystemShutdownExW
+_InitiateSystemShutdownExW.argtypes = (
+    wintypes.LPWSTR,  # lpMachineName
+    wintypes.LPWSTR,  # lpMessage
+    wintypes.DWORD,  # dwTimeout
+    wintypes.BOOL,  # bForceAppsClosed
+    wintypes.BOOL,  # bRebootAfterShutdown
+    wintypes.DWORD,  # dwReason
+)
+_InitiateSystemShutdownExW.restype = wintypes.BOOL
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_ExitWindowsEx = _user32.ExitWindowsEx
+_ExitWindowsEx.argtypes = (wintypes.UINT, wintypes.DWORD)
+_ExitWindowsEx.restype = wintypes.BOOL
+
+_powrprof = ctypes.WinDLL("powrprof", use_last_error=True)
+_SetSuspendState = _powrprof.SetSuspendState
+_SetSuspendState.argtypes = (wintypes.BOOLEAN, wintypes.BOOLEAN, wintypes.BOOLEAN)
+_SetSuspendState.restype = wintypes.BOOLEAN
+
+
+def _initiate_shutdown(*, reboot: bool, force: bool, delay: int):
+    if force:
+        delay = 0
+    elif not delay:
+        delay = _DEFAULT_SHUTDOWN_DELAY
+
+    enable_privilege(win32security.SE_SHUTDOWN_NAME)
+    # Apps are only closed without a chance to save when force is given
+    if not _InitiateSystemShutdownExW(None, None, delay, force, reboot, _SHTDN_REASON_FLAG_PLANNED):
+        raise ctypes.WinError(ctypes.get_last_error())
+
 
 class FreezeDetector(threading.Thread):
 
@@ -12,7 +53,7 @@ class FreezeDetector(threading.Thread):
         super().__init__(daemon=True)
         self._threshold = threshold
         self._frozen = False
-        self._stop = False
+        self._stop_event = threading.Event()  # Thread already has a _stop() method used by join()
 
     def was_frozen(self) -> bool:
         _frozen = self._frozen
@@ -20,65 +61,69 @@ class FreezeDetector(threading.Thread):
         return _frozen
 
     def stop(self):
-        self._stop = True
+        self._stop_event.set()
         self.join()
 
     def run(self):
-        last_time = time.time()
-        while True:
-            time.sleep(0.1)
-            if self._stop == True:
-                return
-            if time.time() - self._threshold > last_time:
+        # Detecting a multi-second freeze does not need fine resolution
+        interval = min(0.5, self._threshold / 4)
+        last_time = time.monotonic()
+        while not self._stop_event.wait(interval):
+            now = time.monotonic()
+            if now - last_time > self._threshold:
                 self._frozen = True
-            last_time = time.time()
+            last_time = now
 
 
 class Workstation:
     def __init__(self):
         self._ws_state_monitor = WorkstationStateMonitor()
-        self._freeze_detector = FreezeDetector()
+        self._freeze_detector = None  # Started on first was_frozen() call
     
     def start_monitor(self):
         self._ws_state_monitor.start()
-        self._freeze_detector.start()
 
     def stop_monitor(self):
         self._ws_state_monitor.stop()
-        self._freeze_detector.stop()
+        if self._freeze_detector is not None:
+            self._freeze_detector.stop()
+            self._freeze_detector = None
 
     def is_locked(self) -> bool:
         """Requires started monitor"""
         return self._ws_state_monitor.is_locked()
 
+    def wait_lock_change(self, timeout: float = None) -> bool:
+        """Requires started monitor. Blocks until the workstation gets locked or unlocked after this call"""
+        return self._ws_state_monitor.wait_state_change(timeout)
+
+    def wait_locked(self, timeout: float = None) -> bool:
+        """Requires started monitor. Blocks until the workstation is locked, returns at once if it already is"""
+        return self._ws_state_monitor.wait_locked(timeout)
+
     def was_frozen(self) -> bool:
-        """Requires started monitor"""
+        """Freeze detection starts on the first call, so that call always returns False"""
+        if self._freeze_detector is None:
+            self._freeze_detector = FreezeDetector()
+            self._freeze_detector.start()
         return self._freeze_detector.was_frozen()
 
     def shutdown(self, *, force=False, delay: int = None):
-        if force:
-            os.system(f"shutdown /s /f /t 0")  # does force apps close
-            # os.system(f"shutdown /p") # Does not force close apps but instant shutdown
-        elif delay:
-            os.system(f"shutdown /s /t {delay}")
-        else:
-            # Wait for apps close and delay 30 sec
-            os.system(f"shutdown /s")
+        """Without force and delay waits for apps close and delays 30 sec"""
+        _initiate_shutdown(reboot=False, force=force, delay=delay)
 
     def restart(self, *, force=False, delay: int = None):
-        if force:
-            os.system(f"shutdown /r /f /t 0")
-        elif delay:
-            os.system(f"shutdown /r /t {delay}")
-        else:
-            # Wait for apps close and delay 30 sec
-            os.system(f"shutdown /r")
+        """Without force and delay waits for apps close and delays 30 sec"""
+        _initiate_shutdown(reboot=True, force=force, delay=delay)
 
     def hibernate(self):
-        os.system(f"shutdown /h")
+        enable_privilege(win32security.SE_SHUTDOWN_NAME)
+        if not _SetSuspendState(True, False, False):
+            raise ctypes.WinError(ctypes.get_last_error())
 
     def logoff(self):
-        os.system(f"shutdown /l")
+        if not _ExitWindowsEx(win32con.EWX_LOGOFF, 0):
+            raise ctypes.WinError(ctypes.get_last_error())
 
     def lock(self):
         ctypes.windll.user32.LockWorkStation()
@@ -1,9 +1,7 @@
 import threading
-import time
-import inspect
 from collections import defaultdict
-from typing import Callable, Dict, List
-from dataclasses import dataclass, astuple
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass
 
 import pythoncom
 import win32api
@@ -11,35 +9,55 @@ import win32con
 import win32gui
 import win32ts
 
+# Hot window procedure path, bound once at module level
+_WM_CLOSE = win32con.WM_CLOSE
+_WM_DESTROY = win32con.WM_DESTROY
+_DefWindowProc = win32gui.DefWindowProc
+_PostQuitMessage = win32gui.PostQuitMessage
+_DestroyWindow = win32gui.DestroyWindow
+
+
+_WIN32CON_REVERSE: Dict[int, List[str]] | None = None
+
+
+def _win32con_reverse() -> Dict[int, List[str]]:
+    """Value -> names map of win32con, built on first use."""
+    global _WIN32CON_REVERSE
+    if _WIN32CON_REVERSE is None:
+        reverse = {}
+        for constant_name in dir(win32con):
+            if constant_name.startswith("__"):  # Exclude built-in attributes
+                continue
+            value = getattr(win32con, constant_name)
+            if isinstance(value, int):
+                reverse.setdefault(value, []).append(constant_name)
+        _WIN32CON_REVERSE = reverse
+    return _WIN32CON_REVERSE
+
 
 def _get_const(num: int):
-    const = []
-    win32con_dict = {}
-    for constant_name in dir(win32con):
-        if not constant_name.startswith("__"):  # Exclude built-in attributes
-            win32con_dict[constant_name] = getattr(win32con, constant_name)
-    for key, value in win32con_dict.items():
-        if value == num:
-            const.append(key)
-    return const
+    return list(_win32con_reverse().get(num, ()))
 
 
 # ! Type hints are required for dataclass fields
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class Event:
     msg: int | None = 0
     wparam: int | None = 0
     lparam: int | None = 0
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class AnyEvent(Event):
     msg: int | None = None
     wparam: int | None = None
     lparam: int | None = None
 
 
-@dataclass(frozen=True, eq=True)
+_ANY_EVENT = AnyEvent()  # Frozen and all wildcards, one instance is enough
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class LockEvent(Event):
     # * Screen locked
     # https://www.pinvoke.net/default.aspx/wtsapi32.wtsregistersessionnotification
@@ -48,7 +66,7 @@ class LockEvent(Event):
     lparam: int | None = None  # Session identifier
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class UnlockEvent(Event):
     # * Screen unlocked
     # https://www.pinvoke.net/default.aspx/wtsapi32.wtsregistersessionnotification
@@ -57,7 +75,7 @@ class UnlockEvent(Event):
     lparam: int | None = None  # Session identifier
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class DeviceChangeEvent(Event):
     # * USB plugged in/out
     # https://learn.microsoft.com/en-us/windows/win32/devio/wm-devicechange
@@ -66,7 +84,7 @@ class DeviceChangeEvent(Event):
     lparam: int | None = None
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class PowerStatusChangedEvent(Event):
     # * AC/Battery
     # https://www.pinvoke.net/default.aspx/user32/RegisterPowerSettingNotification.html
@@ -75,12 +93,31 @@ class PowerStatusChangedEvent(Event):
     lparam: int | None = None
 
 
+class _HandlersSnapshot(NamedTuple):
+    """Frozen handler buckets read by the window procedure without locking"""
+
+    interesting_msgs: FrozenSet[int]  # Msgs with at least one non AnyEvent handler
+    lone_handlers: Dict[int, Tuple[Callable, Optional[int], Optional[int]]]  # msg -> (handler, wparam, lparam)
+    exact_handlers: Dict[Tuple[int, int, int], Tuple[Callable, ...]]
+    msg_wparam_handlers: Dict[Tuple[int, int], Tuple[Callable, ...]]
+    msg_handlers: Dict[int, Tuple[Callable, ...]]
+    any_handlers: Tuple[Callable, ...]
+
+
 class WorkstationEventsListener(threading.Thread):
     """Monitors workstation session events and invokes registered handlers."""
 
     def __init__(self):
         super().__init__(daemon=True)
-        self.event_handlers: Dict[Event, List[Callable]] = defaultdict(list)
+        # Handlers are bucketed by which event fields are wildcards (None), so dispatch is one lookup per bucket
+        self._exact_handlers: Dict[Tuple[int, int, int], List[Callable]] = defaultdict(list)
+        self._msg_wparam_handlers: Dict[Tuple[int, int], List[Callable]] = defaultdict(list)
+        self._msg_handlers: Dict[int, List[Callable]] = defaultdict(list)
+        self._any_handlers: List[Callable] = []
+        # on() may be called from other threads while messages are pumped. Registration mutates the buckets
+        # under the lock and drops the snapshot, dispatch reads the frozen snapshot (tuples) without locking
+        self._handlers_lock = threading.Lock()
+        self._handlers_snapshot: _HandlersSnapshot | None = None
         self._window_handle = False
 
     def run(self):
@@ -124,38 +161,123 @@ class WorkstationEventsListener(threading.Thread):
 
     def _window_procedure(self, hwnd: int, msg: int, wparam, lparam):
         """Processes window messages and invokes handlers."""
-        for handler in self.event_handlers[astuple(Event(msg, wparam, lparam))]:
-            handler(Event(msg, wparam, lparam))
-        for handler in self.event_handlers[astuple(Event(msg, wparam, None))]:
-            handler(Event(msg, wparam, lparam))
-        for handler in self.event_handlers[astuple(Event(msg, None, None))]:
-            handler(Event(msg, wparam, lparam))
-        for handler in self.event_handlers[astuple(AnyEvent())]:
-            handler(Event(msg, wparam, lparam))
-
-        if msg in [win32con.WM_CLOSE, win32con.WM_DESTROY]:
-            win32gui.PostQuitMessage(0)
-            win32gui.DestroyWindow(hwnd)
+        snapshot = self._handlers_snapshot
+        if snapshot is None:
+            snapshot = self._freeze_handlers()
+        any_handlers = snapshot.any_handlers
+
+        exiting = msg == _WM_CLOSE or msg == _WM_DESTROY
+        try:
+            # Most messages (paint, timers, etc.) have no handlers at all, one set lookup skips them
+            if any_handlers or msg in snapshot.interesting_msgs:
+                lone = snapshot.lone_handlers.get(msg)
+                if lone is not None:
+                    # The only handler registered for this msg, call it directly if its wildcards match
+                    handler, lone_wparam, lone_lparam = lone
+                    if (lone_wparam is None or lone_wparam == wparam) and (
+                        lone_lparam is None or lone_lparam == lparam
+                    ):
+                        handler(Event(msg, wparam, lparam))
+                else:
+                    handlers = (
+                        snapshot.exact_handlers.get((msg, wparam, lparam), ())
+                        + snapshot.msg_wparam_handlers.get((msg, wparam), ())
+                        + snapshot.msg_handlers.get(msg, ())
+                        + any_handlers
+                    )
+                    if handlers:
+                        event = Event(msg, wparam, lparam)  # Built once and only if some handler is going to receive it
+                        for handler in handlers:
+                            handler(event)
+        finally:
+            # After the handlers saw the message, and even if one of them raised
+            if exiting:
+                self._on_destroy(hwnd)
+
+        if exiting:
             return 0
-        return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+        return _DefWindowProc(hwnd, msg, wparam, lparam)
+
+    def _on_destroy(self, hwnd: int):
+        _PostQuitMessage(0)
+        _DestroyWindow(hwnd)
+
+    def _freeze_handlers(self) -> _HandlersSnapshot:
+        with self._handlers_lock:
+            # msg -> [(handler, wparam, lparam)] over all buckets, None fields are wildcards
+            msg_entries = defaultdict(list)
+            for (msg, wparam, lparam), handlers in self._exact_handlers.items():
+                msg_entries[msg].extend((handler, wparam, lparam) for handler in handlers)
+            for (msg, wparam), handlers in self._msg_wparam_handlers.items():
+                msg_entries[msg].extend((handler, wparam, None) for handler in handlers)
+            for msg, handlers in self._msg_handlers.items():
+                msg_entries[msg].extend((handler, None, None) for handler in handlers)
+
+            # Msgs with exactly one handler in any bucket (e.g. WorkstationStateMonitor's) skip the buckets
+            lone_handlers = {}
+            if not self._any_handlers:
+                lone_handlers = {msg: entries[0] for msg, entries in msg_entries.items() if len(entries) == 1}
+
+            self._handlers_snapshot = _HandlersSnapshot(
+                interesting_msgs=frozenset(msg_entries),
+                lone_handlers=lone_handlers,
+                exact_handlers={key: tuple(handlers) for key, handlers in self._exact_handlers.items()},
+                msg_wparam_handlers={key: tuple(handlers) for key, handlers in self._msg_wparam_handlers.items()},
+                msg_handlers={key: tuple(handlers) for key, handlers in self._msg_handlers.items()},
+                any_handlers=tuple(self._any_handlers),
+            )
+            return self._handlers_snapshot
 
     def on(self, event: Event, handler: callable):
         """Registers a handler for a specific event."""
-        if inspect.isclass(event):
+        if event is AnyEvent:
+            event = _ANY_EVENT
+        elif isinstance(event, type):
             event = event()
 
-        self.event_handlers[astuple(event)].append(handler)
+        with self._handlers_lock:
+            self._register(event, handler)
+            self._handlers_snapshot = None
+
+    def _register(self, event: Event, handler: callable):
+        msg, wparam, lparam = event.msg, event.wparam, event.lparam
+        if msg is None and wparam is None and lparam is None:
+            self._any_handlers.append(handler)
+        elif msg is not None and wparam is None and lparam is None:
+            self._msg_handlers[msg].append(handler)
+        elif msg is not None and wparam is not None and lparam is None:
+            self._msg_wparam_handlers[(msg, wparam)].append(handler)
+        elif msg is not None and wparam is not None:
+            self._exact_handlers[(msg, wparam, lparam)].append(handler)
+        else:
+            raise ValueError(f"Unsupported event {event}, only trailing fields can be None (wildcards)")
 
 
 class WorkstationStateMonitor:
 
+    # WM_WTSSESSION_CHANGE wparam -> locked state, other session changes are ignored
+    _LOCK_STATES = {0x7: True, 0x8: False}  # WTS_SESSION_LOCK, WTS_SESSION_UNLOCK
+
     def __init__(self):
-        self.locked = False
+        self._locked_evt = threading.Event()  # Set while the workstation is locked
+        self._state_changed = threading.Condition()
+        self._state_changes = 0  # Waiters wake once this moves past the value they saw on entry
 
         self._ws_listener = WorkstationEventsListener()
 
-        self._ws_listener.on(LockEvent(), lambda e: setattr(self, "locked", True))
-        self._ws_listener.on(UnlockEvent(), lambda e: setattr(self, "locked", False))
+        self._ws_listener.on(Event(0x2B1, None, None), self._on_session_change)  # WM_WTSSESSION_CHANGE
+
+    def _on_session_change(self, event: Event):
+        locked = self._LOCK_STATES.get(event.wparam)
+        if locked is None:
+            return
+        with self._state_changed:
+            if locked:
+                self._locked_evt.set()
+            else:
+                self._locked_evt.clear()
+            self._state_changes += 1
+            self._state_changed.notify_all()
     
     def start(self):
         self._ws_listener.start()
@@ -164,7 +286,17 @@ class WorkstationStateMonitor:
         self._ws_listener.stop()
 
     def is_locked(self) -> bool:
-        return self.locked
+        return self._locked_evt.is_set()
+
+    def wait_locked(self, timeout: float = None) -> bool:
+        """Blocks until the workstation is locked, returns at once if it already is. Returns False on timeout"""
+        return self._locked_evt.wait(timeout)
+
+    def wait_state_change(self, timeout: float = None) -> bool:
+        """Blocks until the workstation gets locked or unlocked after this call. Returns False on timeout"""
+        with self._state_changed:
+            changes = self._state_changes
+            return self._state_changed.wait_for(lambda: self._state_changes != changes, timeout)
 
 
 if __name__ == "__main__":
@@ -172,18 +304,5 @@ if __name__ == "__main__":
     ws_state = WorkstationStateMonitor()
     ws_state.start()
     while True:
+        ws_state.wait_state_change()
         print(ws_state.is_locked())
-        time.sleep(1)
-
-    # def handler(event: Event):
-    #     print(f"msg={event.msg} {hex(event.msg)}, wparam={event.wparam}, lparam={event.lparam}")
-    #     print("get_const", _get_const(event.msg))
-
-    # ws_listener = WorkstationEventsListener()
-    # ws_listener.on(AnyEvent(), handler)
-    # ws_listener.on(LockEvent(), lambda e: print("LockEvent"))
-    # ws_listener.on(UnlockEvent(), lambda e: print("UnlockEvent"))
-    # ws_listener.start()
-    # time.sleep(5)
-    # ws_listener.stop()
-    # ws_listener.join()
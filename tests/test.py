@@ -6,6 +6,7 @@ sys.path.append(str(Path(__file__).parent.parent.absolute()))
 
 from winytils import guiwin
 from src.winytils.workstation import Workstation
+from src.winytils.workstation_events import AnyEvent, Event, LockEvent, WorkstationEventsListener
 from src.winytils.win11toast import toast
 
 
@@ -39,5 +40,46 @@ def test4():
     toast("Hello Python🐍")
 
 
+def test_events_dispatch():
+    """Drives the window procedure directly, the listener thread is not started"""
+    wm_app = 0x8000  # WM_APP, no system meaning
+    listener = WorkstationEventsListener()
+    calls = []
+
+    # Lone handler for a msg, only its non-wildcard fields have to match
+    listener.on(LockEvent, lambda e: calls.append(("lock", e.wparam)))
+    listener._window_procedure(0, 0x2B1, 0x8, 0)
+    listener._window_procedure(0, 0x2B1, 0x7, 0)
+    assert calls == [("lock", 0x7)], calls
+    assert 0x2B1 in listener._handlers_snapshot.lone_handlers
+
+    # All buckets matching a msg, from most to least specific
+    calls.clear()
+    listener.on(Event(wm_app, 1, 2), lambda e: calls.append("exact"))
+    listener.on(Event(wm_app, 1, None), lambda e: calls.append("msg_wparam"))
+    listener.on(Event(wm_app, None, None), lambda e: calls.append("msg"))
+    assert listener._handlers_snapshot is None  # Registration drops the frozen handlers
+    listener._window_procedure(0, wm_app, 1, 2)
+    listener._window_procedure(0, wm_app, 1, 3)
+    listener._window_procedure(0, wm_app, 4, 2)
+    listener._window_procedure(0, wm_app + 1, 1, 2)  # Not interesting, straight to DefWindowProc
+    assert calls == ["exact", "msg_wparam", "msg", "msg_wparam", "msg", "msg"], calls
+    assert wm_app not in listener._handlers_snapshot.lone_handlers
+
+    # AnyEvent handlers see every message, after the specific ones
+    calls.clear()
+    listener.on(AnyEvent, lambda e: calls.append(("any", e.msg)))
+    listener._window_procedure(0, wm_app, 4, 2)
+    listener._window_procedure(0, wm_app + 1, 0, 0)
+    assert calls == ["msg", ("any", wm_app), ("any", wm_app + 1)], calls
+
+    try:
+        listener.on(Event(None, 1, None), lambda e: None)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Leading wildcard must be rejected")
+
+
 if __name__ == "__main__":
     test4()